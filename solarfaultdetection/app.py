@@ -1,12 +1,59 @@
 import streamlit as st
+import io
 from PIL import Image
-from src.predict import load_model, predict, CLASS_NAMES
 from src.fault_info import get_fault_info
 from src.office_locator import find_nearest_office, format_contact_info
 import json
 from datetime import datetime
 from urllib.parse import quote
 
+REPORT_TEMPLATE = """FAULT DETECTION REPORT
+======================
+
+Date: {timestamp}
+User: {user_name}
+Phone: {user_phone}
+Email: {user_email}
+Pincode: {user_pincode}
+Location: {panel_location}
+
+FAULT DETECTED:
+- Type: {fault_type}
+- Confidence: {confidence}
+- Severity: {severity}
+- Description: {description}
+
+SERVICE OFFICE:
+- Name: {office_name}
+- Address: {office_address}
+- Phone: {office_phone}
+- Email: {office_email}
+
+Additional Notes: {additional_notes}
+"""
+
+EMAIL_BODY_TEMPLATE = """Dear {office_name},
+
+I am reporting a solar panel fault detected through the fault detection system.
+
+FAULT DETAILS:
+- Type: {fault_type}
+- Confidence: {confidence}
+- Severity: {severity}
+
+MY DETAILS:
+- Name: {user_name}
+- Phone: {user_phone}
+- Email: {user_email}
+- Pincode: {user_pincode}
+- Panel Location: {panel_location}
+
+Additional Notes: {additional_notes}
+
+Please contact me to schedule a service visit.
+
+Thank you."""
+
 st.set_page_config(
     page_title="Solar Fault Detection",
     page_icon="🔆",
@@ -18,9 +65,117 @@ st.markdown("Upload an EL (Electroluminescence) image of a solar panel to detect
 
 @st.cache_resource
 def get_model():
-    return load_model()
+    # torch is imported here rather than at module level so reruns that
+    # don't analyze an image skip the import cost
+    import torch
+    from src.predict import load_model, predict
+    
+    # Let cuDNN autotune convolutions for the fixed input shape and allow TF32 on Tensor Cores
+    torch.set_float32_matmul_precision("high")
+    torch.backends.cudnn.benchmark = True
+    
+    model = load_model()
+    # NHWC weights hit the fast cuDNN/Tensor-Core conv kernels; the NCHW input is
+    # converted once at the first conv and activations stay channels_last after that
+    model = model.to(memory_format=torch.channels_last)
+    # Script and freeze for this machine's backend (MKLDNN/cuDNN conv fusion)
+    model = torch.jit.optimize_for_inference(torch.jit.script(model.eval()))
+    # Warm up so the first real request doesn't pay TorchScript profiling
+    # and cuDNN autotuning costs
+    dummy = Image.new("RGB", (224, 224))
+    with torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16, enabled=torch.cuda.is_available()):
+        for _ in range(2):
+            predict(dummy, model)
+    return model
+
+# Bounded: the cache is shared by all sessions and keyed on user uploads
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def cached_predict(image_bytes: bytes) -> dict:
+    import torch
+    from src.predict import predict
+    
+    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    model = get_model()
+    # FP16 autocast runs convolutions on Tensor Cores when a GPU is available
+    with torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16, enabled=torch.cuda.is_available()):
+        result = predict(image, model)
+    # Sort once here so reruns reuse the ordering from the cache
+    result["sorted_probs"] = sorted(
+        result["probabilities"].items(),
+        key=lambda x: x[1],
+        reverse=True
+    )
+    return result
+
+@st.cache_data(show_spinner=False)
+def cached_fault_info(fault_type: str) -> dict:
+    return get_fault_info(fault_type)
 
-model = get_model()
+@st.cache_data(show_spinner=False)
+def cached_nearest_office(user_pincode: str):
+    return find_nearest_office(user_pincode)
+
+@st.cache_data(show_spinner=False)
+def render_fault_markdown(fault_type: str) -> str:
+    fault_info = cached_fault_info(fault_type)
+    parts = [
+        "---",
+        "### 📋 Fault Description",
+        fault_info.get("description", "No description available."),
+    ]
+    
+    # Severity
+    if fault_type != "Healthy Panel":
+        parts.append(f"**Severity:** {fault_info.get('severity', 'Unknown')}")
+    
+    # Symptoms (if available)
+    if "symptoms" in fault_info:
+        parts.append("### 🔍 Symptoms")
+        parts.append("\n".join(f"- {symptom}" for symptom in fault_info["symptoms"]))
+    
+    # Repair steps
+    parts += ["---", "### 🔧 Repair Instructions", "**Step-by-step repair process:**"]
+    parts.append("\n".join(
+        f"{i}. {step}" for i, step in enumerate(fault_info.get("repair_steps", []), 1)
+    ))
+    
+    # Prevention tips
+    parts += ["---", "### 🛡️ Prevention Tips"]
+    parts.append("\n".join(f"- {tip}" for tip in fault_info.get("prevention", [])))
+    
+    # Cost estimate (if available)
+    if "cost_estimate" in fault_info:
+        parts += ["---", f"### 💰 Estimated Repair Cost: **{fault_info['cost_estimate']}**"]
+    
+    return "\n\n".join(part for part in parts if part)
+
+# Bounded: the cache is shared by all sessions and keyed on user uploads
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def make_thumbnail(image_bytes: bytes) -> bytes:
+    # Downscaled JPEG keeps the bytes sent to the browser small on every rerun
+    thumb = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    thumb.thumbnail((512, 512))
+    buf = io.BytesIO()
+    thumb.save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+def build_mailto(office_name, office_email, fault_type, confidence, severity,
+                 user_name, user_phone, user_email, user_pincode, panel_location,
+                 additional_notes) -> str:
+    email_subject = quote(f"Fault Report - {fault_type}")
+    email_body = quote(EMAIL_BODY_TEMPLATE.format_map({
+        "office_name": office_name,
+        "fault_type": fault_type,
+        "confidence": confidence,
+        "severity": severity,
+        "user_name": user_name,
+        "user_phone": user_phone,
+        "user_email": user_email,
+        "user_pincode": user_pincode,
+        "panel_location": panel_location,
+        "additional_notes": additional_notes
+    }))
+    return f"mailto:{office_email}?subject={email_subject}&body={email_body}"
 
 # Sidebar with information
 with st.sidebar:
@@ -67,17 +222,17 @@ with col1:
     )
 
     if uploaded_image:
-        image = Image.open(uploaded_image).convert("RGB")
-        st.image(image, caption="Uploaded EL Image", use_container_width=True)
+        image_bytes = uploaded_image.getvalue()
+        st.image(make_thumbnail(image_bytes), caption="Uploaded EL Image", use_container_width=True)
 
 with col2:
     if uploaded_image:
         with st.spinner("Analyzing image..."):
-            result = predict(image, model)
+            result = cached_predict(image_bytes)
         
         fault_type = result["fault_type"]
         confidence = result["confidence"]
-        fault_info = get_fault_info(fault_type)
+        fault_info = cached_fault_info(fault_type)
         
         # Display main result
         st.markdown("### 🧪 Detection Result")
@@ -92,48 +247,13 @@ with col2:
         else:
             st.info(f"**{fault_type}** (Confidence: {confidence*100:.1f}%)")
         
-        # Fault description
-        st.markdown("---")
-        st.markdown("### 📋 Fault Description")
-        st.write(fault_info.get("description", "No description available."))
-        
-        # Severity
-        if fault_type != "Healthy Panel":
-            st.markdown(f"**Severity:** {fault_info.get('severity', 'Unknown')}")
-        
-        # Symptoms (if available)
-        if "symptoms" in fault_info:
-            st.markdown("### 🔍 Symptoms")
-            for symptom in fault_info["symptoms"]:
-                st.markdown(f"- {symptom}")
-        
-        # Repair steps
-        st.markdown("---")
-        st.markdown("### 🔧 Repair Instructions")
-        st.markdown("**Step-by-step repair process:**")
-        for i, step in enumerate(fault_info.get("repair_steps", []), 1):
-            st.markdown(f"{i}. {step}")
-        
-        # Prevention tips
-        st.markdown("---")
-        st.markdown("### 🛡️ Prevention Tips")
-        for tip in fault_info.get("prevention", []):
-            st.markdown(f"- {tip}")
-        
-        # Cost estimate (if available)
-        if "cost_estimate" in fault_info:
-            st.markdown("---")
-            st.markdown(f"### 💰 Estimated Repair Cost: **{fault_info['cost_estimate']}**")
+        # Description, symptoms, repair steps, prevention tips and cost
+        st.markdown(render_fault_markdown(fault_type))
         
         # Show all probabilities in expander
         with st.expander("📊 View All Predictions"):
             st.markdown("**Prediction probabilities:**")
-            sorted_probs = sorted(
-                result["probabilities"].items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )
-            for fault_name, prob in sorted_probs:
+            for fault_name, prob in result["sorted_probs"]:
                 st.progress(prob, text=f"{fault_name}: {prob*100:.1f}%")
         
         # Service Office Location Section
@@ -154,7 +274,7 @@ with col2:
         
         if find_office_btn or (user_pincode and len(user_pincode) >= 4):
             if user_pincode:
-                office = find_nearest_office(user_pincode)
+                office = cached_nearest_office(user_pincode)
                 
                 if office:
                     st.markdown("---")
@@ -223,30 +343,23 @@ with col2:
                                         st.json(report)
                                     
                                     # Generate report text
-                                    report_text = f"""FAULT DETECTION REPORT
-======================
-
-Date: {report['timestamp']}
-User: {user_name}
-Phone: {user_phone}
-Email: {user_email}
-Pincode: {user_pincode}
-Location: {panel_location}
-
-FAULT DETECTED:
-- Type: {fault_type}
-- Confidence: {confidence*100:.1f}%
-- Severity: {fault_info.get('severity', 'Unknown')}
-- Description: {fault_info.get('description', '')}
-
-SERVICE OFFICE:
-- Name: {office['office_name']}
-- Address: {office['address']}
-- Phone: {office['phone']}
-- Email: {office['email']}
-
-Additional Notes: {additional_notes}
-"""
+                                    report_text = REPORT_TEMPLATE.format_map({
+                                        "timestamp": report["timestamp"],
+                                        "user_name": user_name,
+                                        "user_phone": user_phone,
+                                        "user_email": user_email,
+                                        "user_pincode": user_pincode,
+                                        "panel_location": panel_location,
+                                        "fault_type": fault_type,
+                                        "confidence": f"{confidence*100:.1f}%",
+                                        "severity": fault_info.get("severity", "Unknown"),
+                                        "description": fault_info.get("description", ""),
+                                        "office_name": office["office_name"],
+                                        "office_address": office["address"],
+                                        "office_phone": office["phone"],
+                                        "office_email": office["email"],
+                                        "additional_notes": additional_notes
+                                    })
                                     
                                     # Contact options
                                     st.markdown("### 📞 Contact Office")
@@ -254,29 +367,19 @@ Additional Notes: {additional_notes}
                                     
                                     with col_contact1:
                                         st.markdown(f"**📧 Email Office**")
-                                        email_subject = quote(f"Fault Report - {fault_type}")
-                                        email_body = quote(f"""Dear {office['office_name']},
-
-I am reporting a solar panel fault detected through the fault detection system.
-
-FAULT DETAILS:
-- Type: {fault_type}
-- Confidence: {confidence*100:.1f}%
-- Severity: {fault_info.get('severity', 'Unknown')}
-
-MY DETAILS:
-- Name: {user_name}
-- Phone: {user_phone}
-- Email: {user_email}
-- Pincode: {user_pincode}
-- Panel Location: {panel_location}
-
-Additional Notes: {additional_notes}
-
-Please contact me to schedule a service visit.
-
-Thank you.""")
-                                        email_link = f"mailto:{office['email']}?subject={email_subject}&body={email_body}"
+                                        email_link = build_mailto(
+                                            office_name=office["office_name"],
+                                            office_email=office["email"],
+                                            fault_type=fault_type,
+                                            confidence=f"{confidence*100:.1f}%",
+                                            severity=fault_info.get("severity", "Unknown"),
+                                            user_name=user_name,
+                                            user_phone=user_phone,
+                                            user_email=user_email,
+                                            user_pincode=user_pincode,
+                                            panel_location=panel_location,
+                                            additional_notes=additional_notes
+                                        )
                                         st.markdown(f"[📧 {office['email']}]({email_link})")
                                     
                                     with col_contact2:
@@ -1,10 +1,18 @@
 """
 Script to create a valid PyTorch model file for solar fault detection.
-Run this once to generate model/solar_model.pth
+Run this once to generate model/solar_model.pth. It also writes:
+- model/solar_model_fp16.pth: half-precision weights (not loaded by the app,
+  which runs the FP32 weights under FP16 autocast)
+- model/solar_model_jit.pt: TorchScript model
+- model/solar_model.onnx: ONNX graph (when onnx is installed)
+- model/solar_model.trt: TensorRT engine (when TensorRT is installed)
+- model/solar_model_int8.pt: INT8 model (when calibration images are provided)
 """
 
+import importlib.util
 import torch
-from torchvision import models
+from torchvision import models, transforms
+from PIL import Image
 from torch import nn
 from pathlib import Path
 
@@ -14,8 +22,15 @@ Path("model").mkdir(exist_ok=True)
 # Create the model architecture
 # Update number of classes based on fault types in predict.py
 NUM_CLASSES = 8  # Healthy + 7 fault types
-model = models.resnet18(pretrained=False)
-model.fc = nn.Linear(model.fc.in_features, NUM_CLASSES)
+# Backbone must match the one built in predict.py.
+# "mobilenet_v3_small" is ~30x fewer FLOPs than ResNet-18 and ~5x smaller on disk.
+ARCH = "resnet18"
+if ARCH == "mobilenet_v3_small":
+    model = models.mobilenet_v3_small(weights=None)
+    model.classifier[-1] = nn.Linear(model.classifier[-1].in_features, NUM_CLASSES)
+else:
+    model = models.resnet18(weights=None)
+    model.fc = nn.Linear(model.fc.in_features, NUM_CLASSES)
 
 # Initialize with random weights (for testing/demo purposes)
 # In production, you would load trained weights here
@@ -26,10 +41,125 @@ print("Note: This is a placeholder model for testing. Train with your data for r
 model_path = Path("model/solar_model.pth")
 torch.save(model.state_dict(), model_path)
 
+# Save a half-precision copy for Tensor-Core GPUs
+fp16_path = Path("model/solar_model_fp16.pth")
+torch.save({k: v.half() if v.is_floating_point() else v for k, v in model.state_dict().items()}, fp16_path)
+
 # Verify the file was created
 file_size = model_path.stat().st_size / (1024 * 1024)  # Size in MB
 print(f"Model saved successfully!")
 print(f"   Location: {model_path}")
 print(f"   Size: {file_size:.2f} MB")
+print(f"   FP16 copy: {fp16_path}")
+
+# Save a TorchScript version of the model
+# torch.jit.optimize_for_inference bakes in settings for the machine it runs on,
+# so it is applied after loading on the target device rather than before saving
+model.eval()
+jit_path = Path("model/solar_model_jit.pt")
+torch.jit.save(torch.jit.script(model), jit_path)
+print(f"TorchScript model saved to {jit_path}")
+
+# Export ONNX graph for TensorRT / other runtimes
+onnx_path = Path("model/solar_model.onnx")
+onnx_exported = False
+if importlib.util.find_spec("onnx") is None:
+    print("onnx not installed, skipping ONNX export.")
+else:
+    try:
+        torch.onnx.export(
+            model,
+            torch.randn(1, 3, 224, 224),
+            onnx_path,
+            input_names=["input"],
+            output_names=["logits"],
+            dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+            opset_version=17
+        )
+        onnx_exported = True
+        print(f"ONNX graph exported to {onnx_path}")
+    except ImportError as e:
+        # Recent torch versions default to the dynamo exporter, which also needs onnxscript
+        print(f"ONNX export unavailable ({e}), skipping.")
+
+# Build TensorRT engine (FP16/TF32, batch 1-16) if TensorRT is available
+try:
+    import tensorrt as trt
+except ImportError:
+    trt = None
+
+if trt is None:
+    print("TensorRT not installed, skipping engine build.")
+elif not onnx_exported:
+    print("No ONNX graph, skipping TensorRT engine build.")
+else:
+    logger = trt.Logger(trt.Logger.WARNING)
+    builder = trt.Builder(logger)
+    network = builder.create_network(1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH))
+    parser = trt.OnnxParser(network, logger)
+    config = builder.create_builder_config()
+    config.set_flag(trt.BuilderFlag.FP16)
+    config.set_flag(trt.BuilderFlag.TF32)
+    profile = builder.create_optimization_profile()
+    profile.set_shape("input", (1, 3, 224, 224), (1, 3, 224, 224), (16, 3, 224, 224))
+    config.add_optimization_profile(profile)
+
+    engine = None
+    if parser.parse(onnx_path.read_bytes()):
+        engine = builder.build_serialized_network(network, config)
+    else:
+        print("Failed to parse ONNX graph:")
+        for i in range(parser.num_errors):
+            print(f"   {parser.get_error(i)}")
+
+    if engine is None:
+        print("TensorRT engine build failed, skipping.")
+    else:
+        engine_path = Path("model/solar_model.trt")
+        engine_path.write_bytes(engine)
+        print(f"TensorRT engine saved to {engine_path}")
+
+# INT8 post-training static quantization for CPU-only deployments
+# The quantizable ResNet-18 variant carries the QuantStub/DeQuantStub wrappers
+# and a fuse_model() helper for conv+bn+relu fusion
+# Put a handful of representative EL images in CALIBRATION_DIR to enable it
+CALIBRATION_DIR = Path("calibration_images")
+calibration_files = sorted(
+    p for p in CALIBRATION_DIR.glob("*") if p.suffix.lower() in {".jpg", ".jpeg", ".png"}
+)
+
+if ARCH != "resnet18":
+    print(f"INT8 export only supports resnet18, skipping for {ARCH}.")
+elif not calibration_files:
+    print(f"No calibration images found in {CALIBRATION_DIR}/, skipping INT8 export.")
+else:
+    from torchvision.models import quantization as qmodels
+
+    int8_model = qmodels.resnet18(weights=None, quantize=False)
+    int8_model.fc = nn.Linear(int8_model.fc.in_features, NUM_CLASSES)
+    int8_model.load_state_dict(model.state_dict())
+    int8_model.eval()
+    int8_model.fuse_model()
+    int8_model.qconfig = torch.ao.quantization.get_default_qconfig("x86")
+    torch.ao.quantization.prepare(int8_model, inplace=True)
+
+    # Calibrate observers on real EL images
+    # predict.py is not in this repo: these transforms assume its standard
+    # 224x224 resize + ImageNet normalization. Keep them in sync with predict.py
+    preprocess = transforms.Compose([
+        transforms.Resize((224, 224)),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+    ])
+    with torch.no_grad():
+        for image_path in calibration_files:
+            image = Image.open(image_path).convert("RGB")
+            int8_model(preprocess(image).unsqueeze(0))
+
+    torch.ao.quantization.convert(int8_model, inplace=True)
+    int8_path = Path("model/solar_model_int8.pt")
+    torch.jit.save(torch.jit.script(int8_model), int8_path)
+    print(f"INT8 model saved to {int8_path} (calibrated on {len(calibration_files)} images)")
+
 print(f"\nYou can now run: streamlit run app.py")
 